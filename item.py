@@ -1,10 +1,18 @@
 class Item:
-    def __init__(self, item_name: str, item_price: int, item_hashtags: list, item_description: str):
+    def __init__(self, item_name: str, item_price: int, item_hashtags: frozenset, item_description: str):
         self.name = item_name
         self.price = item_price
         self.hashtags = item_hashtags
         self.description = item_description
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Item):
+            return NotImplemented
+        return self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash(self.name)
+
     def __str__(self) -> str:
         return f'Name:\t\t\t{self.name}\n' \
                f'Price:\t\t\t{self.price}\n' \
@@ -1,4 +1,6 @@
-from errors import ItemAlreadyExistsError, ItemNotExistError
+from collections import Counter
+
+from errors import ItemAlreadyExistsError, ItemNotExistError, TooManyMatchesError
 from item import Item
 
 
@@ -10,6 +12,14 @@ class ShoppingCart:
     -----------
     items : list
         all the items that in the shopping cart
+    _by_name : dict
+        the items in the shopping cart keyed by their name - for fast membership checks
+    _hashtag_counter : Counter
+        the number of items in the shopping cart carrying each hashtag
+    _subtotal : int
+        the running total price of the items in the shopping cart
+    version : int
+        incremented on every change of the shopping cart content
 
     Methods
     -------
@@ -27,6 +37,10 @@ class ShoppingCart:
         """initialize new list of items - empty shopping cart
         """
         self.items = []
+        self._by_name = {}
+        self._hashtag_counter = Counter()
+        self._subtotal = 0
+        self.version = 0
 
     def __len__(self):
         """Return the length of the list - number of items
@@ -47,6 +61,16 @@ class ShoppingCart:
         """
         return iter(self.items)
 
+    def __contains__(self, item: Item) -> bool:
+        """Return whether the given item is in the shopping cart
+
+        Returns
+        --------
+        bool
+            True if an item with the same name is in the shopping cart
+        """
+        return item.name in self._by_name
+
     def add_item(self, item: Item):
         """Add the given item to the shopping cart
 
@@ -60,30 +84,56 @@ class ShoppingCart:
          ItemAlreadyExistError -
             if item already exists in the shopping cart
         """
-        if item in self.items:
+        if item.name in self._by_name:
             raise ItemAlreadyExistsError
 
         self.items.append(item)
+        self._by_name[item.name] = item
+        self._hashtag_counter.update(item.hashtags)
+        self._subtotal += item.price
+        self.version += 1
 
-    def remove_item(self, item_name: str):
+    def remove_item(self, item_name: str) -> Item:
         """Remove the item with the given name from the shopping cart
 
+        Note: not the whole item's name must be given, but rather a distinct substring.
+
         Parameter
         ----------
         item_name : str
             name of the item to remove from the shopping cart
 
+        Returns
+        --------
+        Item
+            the removed item
+
         Raises
         ----------
          ItemNotExistError -
             if no item with the given name exists
+         TooManyMatchesError -
+            if there are multiply items matching the given name
         """
-        for item in self.items:
+        found_index = None
+        for index, item in enumerate(self.items):
             if item_name in item.name:
-                self.items.remove(item)
-                return
-
-        raise ItemNotExistError
+                if found_index is not None:
+                    raise TooManyMatchesError
+                found_index = index
+        if found_index is None:
+            raise ItemNotExistError
+
+        found = self.items.pop(found_index)
+        del self._by_name[found.name]
+        self._hashtag_counter.subtract(found.hashtags)
+        self._subtotal -= found.price
+        for tag in found.hashtags:
+            if self._hashtag_counter[tag] <= 0:
+                self._hashtag_counter.pop(tag, None)
+        self.version += 1
+
+        return found
 
     def get_subtotal(self) -> int:
         """ Return the subtotal price of all the items currently in the shopping cart
@@ -93,6 +143,5 @@ class ShoppingCart:
         int
             the price of all the items currently in the shopping cart
         """
-        sub_total = [item.price for item in self.items]
-        return sum(sub_total)
+        return self._subtotal
 
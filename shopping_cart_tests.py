@@ -1,6 +1,6 @@
 import pytest
 
-from errors import ItemNotExistError, ItemAlreadyExistsError
+from errors import ItemNotExistError, ItemAlreadyExistsError, TooManyMatchesError
 from shopping_cart import ShoppingCart
 from store import Store
 
@@ -44,3 +44,13 @@ def test_add_and_remove_same_item(store):
     shopping_cart.remove_item(item.name)
 
     assert shopping_cart.get_subtotal() == 0
+
+
+def test_remove_item_with_too_generic_name(store):
+    shopping_cart = ShoppingCart()
+    for item in store.get_items()[:2]:
+        shopping_cart.add_item(item)
+
+    with pytest.raises(TooManyMatchesError):
+        shopping_cart.remove_item('')
+    assert len(shopping_cart) == 2
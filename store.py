@@ -1,10 +1,35 @@
+import json
+import os
+import stat
+import sys
+import tempfile
 import yaml
 
-from collections import Counter
+from bisect import bisect_right
+from collections import defaultdict
 from errors import ItemNotExistError, TooManyMatchesError
 from item import Item
 from shopping_cart import ShoppingCart
 
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_CACHE_SUFFIX = '.cache.json'
+
+SEARCH_CACHE_SIZE = 128
+
+
+def _intern(value):
+    """Intern the given value if it is a string - YAML may give other scalars, e.g. numeric hashtags"""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 class Store:
     """
@@ -12,10 +37,21 @@ class Store:
 
     Attributes
     ----------
-    _items : list
+    _items : tuple
         the items in the store.
     _shopping_cart : ShoppingCart
         the shopping cart of customer in the store.
+    _by_hashtag : dict
+        index from each hashtag to the list of items that have it.
+    _name_trigrams : dict
+        index from each 3 letters substring of a name to the set of positions in _items
+        of the items that contain it in their name.
+    _names_corpus : str
+        the names of all the items joined by a null character - scanned at once for short names.
+    _name_starts : list
+        the offset in _names_corpus where the name of each item starts.
+    _search_cache : dict
+        sorted search results by (search kind, query), valid for the shopping cart version _cache_version.
 
     Methods
     --------
@@ -47,10 +83,63 @@ class Store:
             the path of the file that consist store items and details
 
         """
-        with open(path) as inventory:
-            items_raw = yaml.load(inventory, Loader=yaml.FullLoader)['items']
-        self._items = self._convert_to_item_objects(items_raw)
+        items_raw = self._load_inventory(path)
+        self._items = tuple(self._convert_to_item_objects(items_raw))
+        (self._by_hashtag, self._name_trigrams,
+         self._names_corpus, self._name_starts) = self._build_indexes(self._items)
         self._shopping_cart = ShoppingCart()
+        self._search_cache = {}
+        self._cache_version = self._shopping_cart.version
+
+    @staticmethod
+    def _load_inventory(path):
+        """--static method--
+        Return the raw items from the given file.
+
+        The parsed items are cached in a JSON file next to the given file together with the
+        modification time and size of the file, and used instead of parsing the YAML again as long as both match.
+
+        Parameter
+        -----------
+        path : str
+            the path of the file that consist store items and details
+
+        Returns
+        -----------
+        list
+            A list of dictionaries - each dictionary represent an item
+        """
+        cache_path = path + JSON_CACHE_SUFFIX
+        try:
+            source = os.stat(path)
+            with open(cache_path, 'rb') as cache:
+                cached = orjson.loads(cache.read()) if orjson else json.load(cache)
+            if cached['mtime_ns'] == source.st_mtime_ns and cached['size'] == source.st_size:
+                return cached['items']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        with open(path) as inventory:
+            source = os.fstat(inventory.fileno())
+            items_raw = yaml.load(inventory, Loader=_Loader)['items']
+
+        cached = {'mtime_ns': source.st_mtime_ns, 'size': source.st_size, 'items': items_raw}
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as cache:
+                    # without passthrough orjson would write dates as strings - raise TypeError like json does
+                    cache.write(orjson.dumps(cached, option=orjson.OPT_PASSTHROUGH_DATETIME) if orjson
+                                else json.dumps(cached).encode())
+                os.chmod(tmp_path, stat.S_IMODE(source.st_mode))
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError):
+            pass
+
+        return items_raw
 
     @staticmethod
     def _convert_to_item_objects(items_raw):
@@ -64,19 +153,101 @@ class Store:
             which means for each dictionary there are the keys -
                     name:str , price: int, hashtags: list, description: str.
         """
-        return [Item(item['name'],
+        return [Item(_intern(item['name']),
                      int(item['price']),
-                     item['hashtags'],
+                     frozenset(_intern(tag) for tag in item['hashtags']),
                      item['description'])
                 for item in items_raw]
 
-    def get_items(self) -> list:
-        """Return list of all the items in the store
+    @staticmethod
+    def _build_indexes(items):
+        """--static method--
+        Build the search indexes over the given items
+
+        Parameter
+        -----------
+        items : tuple
+            the items in the store
+
+        Returns
+        -----------
+        tuple
+            (hashtag -> list of items, name trigram -> set of item positions,
+             names corpus, offset of each name in the corpus)
+        """
+        by_hashtag = defaultdict(list)
+        name_trigrams = defaultdict(set)
+        name_starts = []
+        offset = 0
+        for position, item in enumerate(items):
+            name_starts.append(offset)
+            offset += len(item.name) + 1
+            for tag in item.hashtags:
+                by_hashtag[tag].append(item)
+            for i in range(len(item.name) - 2):
+                name_trigrams[item.name[i:i + 3]].add(position)
+
+        return dict(by_hashtag), dict(name_trigrams), '\0'.join(item.name for item in items), name_starts
+
+    def _find_by_name(self, item_name: str):
+        """---helper function---
+        Return an iterator over all the items in the store that the given name appear in their name.
+
+        Names of at least 3 letters are looked up in the trigram index,
+        shorter names are searched in the names corpus with a single C-level scan.
+
+        Parameter
+        -----------
+        item_name: str
+                the name to be searched. name or sub-name of item's name.
+
+        Returns
+        ----------
+        iterator
+            the items that the given name appear in their name
+        """
+        if len(item_name) >= 3:
+            trigrams = {item_name[i:i + 3] for i in range(len(item_name) - 2)}
+            sets = sorted((self._name_trigrams.get(trigram, set()) for trigram in trigrams), key=len)
+            candidates = [self._items[position] for position in sets[0].intersection(*sets[1:])]
+        elif item_name and '\0' not in item_name:
+            return self._scan_names(item_name)
+        else:
+            candidates = self._items
+
+        contains = str.__contains__
+        return (item for item in candidates if contains(item.name, item_name))
+
+    def _scan_names(self, item_name: str):
+        """---helper function---
+        Yield all the items that the given name appear in their name by searching the names corpus.
+
+        Parameter
+        -----------
+        item_name: str
+                the name to be searched - must not contain a null character.
+
+        Yields
+        ----------
+        Item
+            the items that the given name appear in their name, by the store order
+        """
+        starts = self._name_starts
+        position = self._names_corpus.find(item_name)
+        while position != -1:
+            index = bisect_right(starts, position) - 1
+            yield self._items[index]
+            if index + 1 == len(starts):
+                return
+            position = self._names_corpus.find(item_name, starts[index + 1])
+
+    def get_items(self) -> tuple:
+        """Return all the items in the store
 
         Returns
         -------
-        list
-            list of the items in the store
+        tuple
+            read-only sequence of the items in the store
         """
         return self._items
 
@@ -97,12 +268,7 @@ class Store:
         list
             order list with all the items that the given name appear in their name.
         """
-        my_items = []
-        for item in self._items:
-            if item_name in item.name and item not in self._shopping_cart:
-                my_items.append(item)
-
-        return self.sort_by_rate(my_items)
+        return self._cached_search('name', item_name, self._find_by_name)
 
     def search_by_hashtag(self, hashtag: str) -> list:
         """Find a list of items that have the given hashtag.
@@ -121,12 +287,7 @@ class Store:
         list
             order list with all the items that the given hashtag appear in their hashtags list.
         """
-        my_hashtags = []
-        for item in self._items:
-            if hashtag in item.hashtags and item not in self._shopping_cart:
-                my_hashtags.append(item)
-
-        return self.sort_by_rate(my_hashtags)
+        return self._cached_search('hashtag', hashtag, lambda tag: self._by_hashtag.get(tag, ()))
 
     def add_item(self, item_name: str):
         """Adds the item with the given name to the customer's shopping cart
@@ -147,13 +308,15 @@ class Store:
         ItemAlreadyExistError -
             if the item correspond to the given name is already in the shopping cart
         """
-        my_items = [item for item in self._items if item_name in item.name]
-        if len(my_items) == 0:
+        found = None
+        for item in self._find_by_name(item_name):
+            if found is not None:
+                raise TooManyMatchesError
+            found = item
+        if found is None:
             raise ItemNotExistError
-        elif len(my_items) > 1:
-            raise TooManyMatchesError
 
-        self._shopping_cart.add_item(my_items[0])
+        self._shopping_cart.add_item(found)
 
     def remove_item(self, item_name: str):
         """Removes the item with the given name from the customer's shopping cart
@@ -172,10 +335,6 @@ class Store:
         TooManyArgumentsError -
             if there are multiply items matching the given name.
         """
-        my_items = [item for item in self._shopping_cart.items if item_name in item.name]
-        if len(my_items) > 1:
-            raise TooManyMatchesError
-
         self._shopping_cart.remove_item(item_name)
 
     def checkout(self) -> int:
@@ -188,31 +347,72 @@ class Store:
         """
         return self._shopping_cart.get_subtotal()
 
-    def compute_rate(self, items_list):
+    def _cached_search(self, kind: str, query: str, find) -> list:
+        """---helper function---
+        Return the sorted items found by the given query that are not in the shopping cart.
+        Results are cached until the shopping cart changes.
+
+        Parameter
+        -----------
+        kind: str
+                the kind of the search - part of the cache key.
+        query: str
+                the searched name or hashtag.
+        find: callable
+                return the items in the store matching the query.
+
+        Returns
+        ----------
+        list
+            sorted by rate
+        """
+        if self._cache_version != self._shopping_cart.version:
+            self._search_cache.clear()
+            self._cache_version = self._shopping_cart.version
+
+        key = (kind, query)
+        result = self._search_cache.get(key)
+        if result is None:
+            if len(self._search_cache) >= SEARCH_CACHE_SIZE:
+                self._search_cache.clear()
+            result = self.sort_by_rate([item for item in find(query) if item not in self._shopping_cart])
+            self._search_cache[key] = result
+
+        return list(result)
+
+    def compute_rate(self, item: Item) -> int:
         """ ---helper function--
-        For each item in the give list return his rate as a tuple (rate,item).
+        Return the rate of the given item.
 
         rate of one item is compute according to -
             the number of hashtags in the current shopping cart that exists in the item hashtags
 
         Parameter
         -----------
-        item_list: list
-                 list to rate.
+        item: Item
+                 item to rate.
 
         Returns
         -----------
-        list
-            list of tuples - (rate,item)
+        int
+            the rate of the item
         """
-        rate_list = []
-        list_of_hashtags = [hashtag for item in self._shopping_cart.items for hashtag in item.hashtags]
-        c = Counter(list_of_hashtags)
-        for item in items_list:
-            rate_numbers = [c[tag] for tag in item.hashtags if tag in list_of_hashtags]
-            rate_list.append((sum(rate_numbers), item))
+        counter_get = self._hashtag_counter_getter()
+        if counter_get is None:
+            return 0
+        return sum(map(counter_get, item.hashtags))
 
-        return rate_list
+    def _hashtag_counter_getter(self):
+        """---helper function---
+        Return a function that gives the number of items in the shopping cart with a given hashtag.
+
+        Returns
+        ----------
+        callable or None
+            the lookup of the shopping cart hashtags counter, None if the shopping cart has no hashtags
+        """
+        c = self._shopping_cart._hashtag_counter
+        return c.__getitem__ if c else None
 
     def sort_by_rate(self, items_list: list):
         """---helper function---
@@ -230,11 +430,8 @@ class Store:
         list
             sorted by rate
         """
-        items_list = sorted(items_list, key=lambda item: item.name)
-        items_list = sorted(self.compute_rate(items_list), key=lambda tup: tup[0], reverse=True)
-
-        return [tup[1] for tup in items_list]
-
-
-
+        counter_get = self._hashtag_counter_getter()
+        if counter_get is None:
+            return sorted(items_list, key=lambda item: item.name)
 
+        return sorted(items_list, key=lambda item: (-sum(map(counter_get, item.hashtags)), item.name))
@@ -1,7 +1,12 @@
+import json
+import os
+import shutil
+import stat
+
 import pytest
 
 from errors import ItemNotExistError, ItemAlreadyExistsError, TooManyMatchesError
-from store import Store
+from store import JSON_CACHE_SUFFIX, Store
 
 
 @pytest.fixture
@@ -9,10 +14,78 @@ def store() -> Store:
     return Store('items.yml')
 
 
+def _write_inventory(path, *names):
+    path.write_text('items:\n' + ''.join(f'  - {{name: {name}, price: 1, hashtags: [H1], description: d}}\n'
+                                          for name in names))
+
+
+def test_load_from_json_cache(tmp_path):
+    path = tmp_path / 'items.yml'
+    shutil.copy('items.yml', path)
+    Store(str(path))
+    cache_path = tmp_path / ('items.yml' + JSON_CACHE_SUFFIX)
+    cached = json.loads(cache_path.read_bytes())
+    cached['items'] = cached['items'][:1]
+    cached['items'][0]['name'] = 'From Cache'
+    cache_path.write_text(json.dumps(cached))
+
+    assert [item.name for item in Store(str(path)).get_items()] == ['From Cache']
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_changed_inventory_is_loaded_instead_of_json_cache(tmp_path):
+    path = tmp_path / 'items.yml'
+    _write_inventory(path, 'Old')
+    Store(str(path))
+
+    _write_inventory(path, 'New')
+    os.utime(path, (os.stat(path).st_atime, os.stat(path).st_mtime + 10))
+    assert [item.name for item in Store(str(path)).get_items()] == ['New']
+
+    _write_inventory(path, 'Newer')
+    os.utime(path, (0, 0))
+    assert [item.name for item in Store(str(path)).get_items()] == ['Newer']
+
+
+@pytest.mark.search
+def test_numeric_hashtag(tmp_path):
+    path = tmp_path / 'items.yml'
+    path.write_text('items:\n'
+                    '  - {name: Calendar, price: 1, hashtags: [2020, H1], description: d}\n')
+    store = Store(str(path))
+
+    assert 2020 in store.get_items()[0].hashtags
+    assert [item.name for item in store.search_by_hashtag('H1')] == ['Calendar']
+
+
+def test_date_hashtag_is_the_same_with_and_without_json_cache(tmp_path):
+    path = tmp_path / 'items.yml'
+    path.write_text('items:\n'
+                    '  - {name: Calendar, price: 1, hashtags: [2020-01-01, H1], description: d}\n')
+    first, second = Store(str(path)), Store(str(path))
+
+    assert first.get_items()[0].hashtags == second.get_items()[0].hashtags
+    assert first.search_by_hashtag('2020-01-01') == second.search_by_hashtag('2020-01-01') == []
+
+
+@pytest.mark.search
+@pytest.mark.add
+def test_items_with_the_same_name_are_kept_apart(tmp_path):
+    path = tmp_path / 'items.yml'
+    _write_inventory(path, 'Dupe', 'Dupe')
+    store = Store(str(path))
+
+    assert len(store.search_by_hashtag('H1')) == 2
+    assert len(store.search_by_name('Dupe')) == 2
+    with pytest.raises(TooManyMatchesError):
+        store.add_item('Dupe')
+    with pytest.raises(TooManyMatchesError):
+        store.add_item('Du')
+
+
 @pytest.mark.search
 def test_lexical_sort_with_empty_shopping_cart_search_by_name(store):
-    expected_items_list = store.get_items()
-    expected_items_list.sort(key=lambda item: item.name)
+    expected_items_list = sorted(store.get_items(), key=lambda item: item.name)
     assert expected_items_list == store.search_by_name('')
 
 
@@ -24,6 +97,14 @@ def test_lexical_sort_with_empty_shopping_cart_and_search_for_item(store):
     assert expected_items_list == store.search_by_name(search_phrase)
 
 
+@pytest.mark.search
+@pytest.mark.parametrize('search_phrase', ['r', 'Sw', '1 ', 's', 'qq'])
+def test_search_by_short_name(store, search_phrase):
+    expected_items_list = sorted((item for item in store.get_items() if search_phrase in item.name),
+                                 key=lambda item: item.name)
+    assert expected_items_list == store.search_by_name(search_phrase)
+
+
 @pytest.mark.search
 def test_search_hashtag_empty_shopping_cart(store):
     hashtag = 'Technology'
@@ -59,6 +140,15 @@ def test_sort_with_hashtag_search_non_empty_cart(store):
     assert result_list == expected_items_names
 
 
+@pytest.mark.search
+def test_repeated_search_reflects_shopping_cart_changes(store):
+    assert [i.name for i in store.search_by_hashtag('H1')] == ['Bbbb', 'Shopping Cart 1', 'Shopping Cart 2']
+    store.add_item('Bbbb')
+    assert [i.name for i in store.search_by_hashtag('H1')] == ['Shopping Cart 1', 'Shopping Cart 2']
+    store.remove_item('Bbbb')
+    assert [i.name for i in store.search_by_hashtag('H1')] == ['Bbbb', 'Shopping Cart 1', 'Shopping Cart 2']
+
+
 @pytest.mark.checkout
 def test_checkout_empty_shopping_cart(store):
     assert store.checkout() == 0